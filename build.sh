@@ -14,6 +14,7 @@ zip -j "$OUTPUT" \
     "$PLUGIN_DIR/rm_web_interface.py" \
     "$PLUGIN_DIR/rm_data.py" \
     "$PLUGIN_DIR/log_helper.py" \
+    "$PLUGIN_DIR/compat.py" \
     "$PLUGIN_DIR/config_widget.py" \
     "$PLUGIN_DIR/plugin-import-name-remarkable_calibre_device_plugin.txt"
 echo "Built: $OUTPUT"
@@ -5,9 +5,20 @@ No developer mode required.
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import hashlib
 import logging
+import mmap
 import os
+import re
+import shutil
+import stat
 import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from typing import TYPE_CHECKING, List
 
 from calibre.devices.interface import DevicePlugin  # type: ignore
@@ -15,12 +26,13 @@ from calibre.devices.usbms.deviceconfig import DeviceConfig  # type: ignore
 
 from . import rm_web_interface
 from .log_helper import trace_calls
-from .rm_data import Book, DeviceBookList, DeviceInfo, PluginSettings
+from .rm_data import Book, DeviceBookList, DeviceInfo, PluginSettings, UploadItem
 
 if TYPE_CHECKING:
     from calibre.ebooks.metadata.book.base import Metadata  # type: ignore
 
 PLUGIN_NAME = "remarkable-calibre-device-plugin"
+PLUGIN_VERSION = (1, 3, 0)
 LOGGER = logging.getLogger(__name__)
 
 # Screen dimensions by model (width × height in inches)
@@ -37,29 +49,121 @@ DEVICE_PDF_SETTINGS: dict[str, dict[str, int]] = {
     "pro-move":  {"margin": 18, "font_size": 14},
 }
 
+# Converted PDFs are cached by content hash + conversion settings so repeat
+# sends and retries skip ebook-convert entirely.  The cache lives in
+# Calibre's per-user cache directory (see _pdf_cache_dir).
+PDF_CACHE_SUBDIR = "remarkable-pdf-cache"
+PDF_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB, oldest entries evicted first
+PDF_CACHE_STALE_TMP_SECS = 3600  # leftovers of an interrupted _store_cached_pdf
+
+# Most EPUB digests remembered by _file_digest, least recently used dropped first
+FILE_DIGEST_CACHE_SIZE = 4096
+
+# build_file_tree progress messages look like "Scanning reMarkable... 12 items found"
+_ITEMS_RE = re.compile(r'(\d+)\s+items?\s+found')
+
+# Rough peak RSS of one ebook-convert process; bounds parallel conversions
+EBOOK_CONVERT_RSS_BUDGET = 600 * 1024 * 1024
+
+# How long a scanned device tree is reused before sync_booklists rescans
+TREE_CACHE_TTL: float = 30.0  # seconds
+
 # Session state
 _device: DeviceInfo | None = None
+_tree_cache: tuple[int, float, rm_web_interface.FileTree] | None = None  # (session_id, monotonic ts, tree)
+_settings_cache: tuple[list, PluginSettings] | None = None  # (extra_customization copy, parsed)
+
+# Background reachability probe (see _ensure_probe)
+_device_reachable: bool = False
+_probe_thread: threading.Thread | None = None
+_probe_ip: str = ""
+_probe_wake = threading.Event()
+_probe_done = threading.Event()
+_probe_stop = threading.Event()
+_confirmed_ip: str | None = None  # web interface answered here (see detect_managed_devices)
 _ebook_convert_path: str | None = None
+_ebook_convert_lock = threading.Lock()
+_work_dir: str | None = None  # private temp dir for converted PDFs (see _temp_pdf_path)
+_file_digests: OrderedDict[tuple[int, int, int, int], bytes] = OrderedDict()  # (dev, ino, mtime_ns, size) -> digest
+_file_digests_lock = threading.Lock()
 
 
 def _books_from_tree(tree: rm_web_interface.FileTree) -> list[Book]:
     """Convert a device file tree into Book entries for the booklist."""
+    # Stream entries straight off the tree so no intermediate
+    # (path, entry) list is built alongside the Books.
     return [
         Book(title=entry.name or path, uuid="", rm_uuid=entry.entry_id, path=path)
-        for path, entry in tree.all_files()
+        for path, entry in tree.iter_files()
     ]
 
 
+def _cached_tree() -> rm_web_interface.FileTree | None:
+    """Return the last scanned tree if it belongs to this session and is fresh."""
+    if _tree_cache is None or _device is None:
+        return None
+    session_id, scanned_at, tree = _tree_cache
+    if session_id != _device.session_id or time.monotonic() - scanned_at >= TREE_CACHE_TTL:
+        return None
+    return tree
+
+
+def _cache_tree(tree: rm_web_interface.FileTree):
+    global _tree_cache
+    _tree_cache = (_device.session_id, time.monotonic(), tree) if _device else None
+
+
+def _probe_loop(interval: float):
+    """Poll the device's port so detect_managed_devices rarely waits on the network."""
+    global _device, _device_reachable
+    while not _probe_stop.is_set():
+        _probe_wake.clear()
+        ip = _probe_ip
+        try:
+            # TCP only: a GET /documents/ from this thread would move the
+            # device's current folder under a running upload batch.
+            reachable = rm_web_interface.is_reachable(ip)
+        except Exception:
+            LOGGER.warning("Device detection failed", exc_info=True)
+            reachable = False
+            _device = None
+        if reachable and (_device is None or _device.ip != ip):
+            _device = DeviceInfo(ip)
+            LOGGER.info("Detected: %s", _device)
+        _device_reachable = reachable
+        _probe_done.set()
+        _probe_wake.wait(interval)
+
+
+def _ensure_probe(ip: str, interval: float):
+    """Start the background probe thread if needed and point it at ip."""
+    global _probe_thread, _probe_ip
+    _probe_ip = ip
+    if _probe_thread is None or not _probe_thread.is_alive():
+        _probe_stop.clear()
+        _probe_thread = threading.Thread(
+            target=_probe_loop, args=(interval,), name="remarkable-probe", daemon=True,
+        )
+        _probe_thread.start()
+
+
 def _find_ebook_convert() -> str:
     """Locate Calibre's ebook-convert CLI tool (cached after first call)."""
     global _ebook_convert_path
     if _ebook_convert_path is not None:
         return _ebook_convert_path
+    with _ebook_convert_lock:
+        # Re-check: another conversion may have finished the search meanwhile.
+        if _ebook_convert_path is None:
+            _ebook_convert_path = _search_ebook_convert()
+    return _ebook_convert_path
 
-    import shutil
+
+def _search_ebook_convert() -> str:
     import sys
 
-    # Walk up from sys.executable looking for ebook-convert
+    # Walk up from sys.executable first so we run the ebook-convert that
+    # belongs to this Calibre, not another install that happens to be on PATH.
     d = os.path.abspath(sys.executable)
     while True:
         parent = os.path.dirname(d)
@@ -69,18 +173,249 @@ def _find_ebook_convert() -> str:
         for name in ('ebook-convert', 'ebook-convert.exe'):
             path = os.path.join(d, name)
             if os.path.isfile(path):
-                _ebook_convert_path = path
-                return _ebook_convert_path
+                return path
 
     # Fallback: system PATH
-    _ebook_convert_path = shutil.which('ebook-convert') or 'ebook-convert'
-    return _ebook_convert_path
+    return shutil.which('ebook-convert') or 'ebook-convert'
+
+
+def _file_digest(path: str) -> bytes:
+    """BLAKE2b digest of a file, memoized by inode, mtime and size.
+
+    Keeps the FILE_DIGEST_CACHE_SIZE most recently used digests.
+    """
+    st = os.stat(path)
+    stat_key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    with _file_digests_lock:
+        cached = _file_digests.get(stat_key)
+        if cached is not None:
+            _file_digests.move_to_end(stat_key)
+            return cached
+
+    h = hashlib.blake2b(digest_size=16)
+    if st.st_size:
+        with open(path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            h.update(mm)
+    digest = h.digest()
+    with _file_digests_lock:
+        _file_digests[stat_key] = digest
+        while len(_file_digests) > FILE_DIGEST_CACHE_SIZE:
+            _file_digests.popitem(last=False)
+    return digest
+
+
+def _pdf_cache_key(epub_path: str, options: tuple) -> str:
+    """Hash the EPUB contents together with the conversion options."""
+    h = hashlib.blake2b(_file_digest(epub_path), digest_size=16)
+    h.update(repr(options).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _temp_pdf_path() -> str:
+    """Return a fresh .pdf path in the plugin's private temp dir.
+
+    The file itself is not created: ebook-convert (or a cache hit's
+    hardlink) creates it, so a failed conversion leaves nothing behind
+    and no placeholder file is made and then overwritten.
+    """
+    global _work_dir
+    if _work_dir is None or not os.path.isdir(_work_dir):
+        _work_dir = tempfile.mkdtemp(prefix="remarkable-calibre-")
+        atexit.register(shutil.rmtree, _work_dir, True)
+    return os.path.join(_work_dir, f"{uuid.uuid4().hex}.pdf")
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink src to dst (replacing dst), falling back to a copy."""
+    try:
+        os.unlink(dst)
+    except OSError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
 
 
-def _convert_epub_to_pdf(epub_path: str, model: str, progress_cb=None,
-                         margin_override: int = 0, font_size_override: int = 0,
-                         font_override: str = "",
-                         embed_all_fonts: bool = True) -> str:
+def _pdf_cache_dir() -> str | None:
+    """Return the PDF cache directory, or None if it can't be used safely.
+
+    Calibre's cache_dir() is per-user and persistent; without it (outside
+    Calibre) a uid-suffixed directory in the system temp dir is used.  The
+    directory is created 0700 and skipped if it is a symlink or owned by
+    another user, so nobody else can read the cache or plant a "hit" in it.
+    """
+    try:
+        from calibre.constants import cache_dir  # type: ignore
+        path = os.path.join(cache_dir(), PDF_CACHE_SUBDIR)
+    except ImportError:
+        uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+        path = os.path.join(tempfile.gettempdir(), f"remarkable-calibre-pdf-cache-{uid}")
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode):  # also rejects a symlink
+            LOGGER.warning("PDF cache %s is not a directory; caching disabled", path)
+            return None
+        if hasattr(os, "getuid"):
+            if st.st_uid != os.getuid():
+                LOGGER.warning("PDF cache %s is owned by uid %d; caching disabled", path, st.st_uid)
+                return None
+            if st.st_mode & 0o077:
+                os.chmod(path, 0o700)
+    except OSError:
+        LOGGER.warning("PDF cache directory %s unavailable", path, exc_info=True)
+        return None
+    return path
+
+
+def _store_cached_pdf(pdf_path: str, cached_path: str):
+    """Publish a freshly converted PDF into the cache atomically."""
+    tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+    try:
+        _link_or_copy(pdf_path, tmp_path)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, cached_path)
+    except OSError:
+        LOGGER.warning("Failed to cache converted PDF %s", pdf_path, exc_info=True)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return
+    _trim_pdf_cache(os.path.dirname(cached_path))
+
+
+def _trim_pdf_cache(cache_dir: str, max_bytes: int = PDF_CACHE_MAX_BYTES):
+    """Evict least recently used PDFs until the cache fits in max_bytes.
+
+    Also removes *.tmp files left behind by an interrupted _store_cached_pdf.
+    """
+    stale_before = time.time() - PDF_CACHE_STALE_TMP_SECS
+    try:
+        entries = []
+        with os.scandir(cache_dir) as it:
+            for de in it:
+                if not de.is_file(follow_symlinks=False):
+                    continue
+                st = de.stat(follow_symlinks=False)
+                if de.name.endswith(".pdf"):
+                    entries.append((st.st_mtime, st.st_size, de.path))
+                elif de.name.endswith(".tmp") and st.st_mtime < stale_before:
+                    try:
+                        os.unlink(de.path)
+                    except OSError:
+                        pass
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _conversion_concurrency(n_items: int) -> int:
+    """How many ebook-convert processes to run at once.
+
+    One per CPU, limited by how many EBOOK_CONVERT_RSS_BUDGET-sized
+    processes fit in available memory.  Without psutil (bundled with
+    Calibre, but optional here) fall back to a fixed cap of 2-4.
+    """
+    cpus = os.cpu_count() or 2
+    try:
+        import psutil
+        mem_workers = max(1, psutil.virtual_memory().available // EBOOK_CONVERT_RSS_BUDGET)
+        limit = min(cpus, mem_workers)
+    except Exception:
+        limit = min(max(cpus, 2), 4)
+    return max(1, min(limit, n_items))
+
+
+def _last_percent(data: bytes) -> int | None:
+    """Return the value of the last "<digits>%" in data, or None.
+
+    ebook-convert progress lines look like "33% Converting...".  Scans
+    backwards from each '%' by hand, which is cheaper than a regex
+    search on every chunk of a verbose conversion.
+    """
+    end = data.rfind(b'%')
+    while end > 0:
+        start = end
+        while start > 0 and 48 <= data[start - 1] <= 57:  # ASCII '0'..'9'
+            start -= 1
+        if start < end:
+            return int(data[start:end])
+        end = data.rfind(b'%', 0, end)
+    return None
+
+
+async def _run_ebook_convert(cmd: list[str], progress_cb=None, timeout_secs: float = 300) -> tuple[int, str]:
+    """Run ebook-convert as an asyncio subprocess.
+
+    stderr is read in raw chunks and percentages are forwarded to
+    progress_cb; stdout is drained so the pipe can never fill up and
+    stall the converter.  Returns (returncode, first 500 chars of stdout).
+    The process is killed on timeout or cancellation.
+    """
+    import subprocess
+    import sys
+
+    kwargs = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **kwargs,
+    )
+    stdout_head = bytearray()
+
+    async def _read_stderr():
+        # Keep a few bytes of the previous chunk: a percentage may straddle chunks.
+        tail = b""
+        while True:
+            chunk = await proc.stderr.read(4096)
+            if not chunk:
+                break
+            if progress_cb is not None and b'%' in chunk:
+                pct = _last_percent(tail + chunk)
+                if pct is not None:
+                    progress_cb(pct / 100.0)
+            tail = chunk[-8:]
+
+    async def _read_stdout():
+        while True:
+            chunk = await proc.stdout.read(4096)
+            if not chunk:
+                break
+            if len(stdout_head) < 500:
+                stdout_head.extend(chunk[:500 - len(stdout_head)])
+
+    readers = [asyncio.ensure_future(_read_stderr()), asyncio.ensure_future(_read_stdout())]
+    try:
+        await asyncio.wait_for(proc.wait(), timeout_secs)
+        await asyncio.gather(*readers)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"ebook-convert timed out after {timeout_secs}s") from None
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+    return proc.returncode, stdout_head.decode("utf-8", errors="replace")
+
+
+async def _convert_epub_to_pdf(epub_path: str, model: str, progress_cb=None,
+                               margin_override: int = 0, font_size_override: int = 0,
+                               font_override: str = "",
+                               embed_all_fonts: bool = False,
+                               heuristics: bool = False) -> str:
     """Convert an EPUB to PDF with page dimensions matched to the device.
 
     Shells out to ebook-convert (Calibre's CLI) because the PDF output
@@ -89,22 +424,43 @@ def _convert_epub_to_pdf(epub_path: str, model: str, progress_cb=None,
 
     Override values (margin, font_size, font) take precedence when non-zero/non-empty.
     Zero/empty means use model defaults from DEVICE_PDF_SETTINGS.
+    heuristics enables ebook-convert's heuristic processing pass.
 
     progress_cb, if provided, is called with a float 0.0..1.0 as
     ebook-convert reports its progress on stderr.
-    """
-    import re
-    import subprocess
-    import sys
-    import time
 
+    Results are cached in _pdf_cache_dir() keyed by the EPUB's content hash
+    and the effective conversion options; a cache hit skips ebook-convert.
+    """
     width_in, height_in = DEVICE_PAGE_SIZE.get(model, DEVICE_PAGE_SIZE["paper-pro"])
     pdf_settings = DEVICE_PDF_SETTINGS.get(model, DEVICE_PDF_SETTINGS["paper-pro"])
     margin = str(margin_override if margin_override else pdf_settings["margin"])
     font_size = str(font_size_override if font_size_override else pdf_settings["font_size"])
 
-    fd, out_path = tempfile.mkstemp(suffix=".pdf")
-    os.close(fd)
+    out_path = _temp_pdf_path()
+
+    # Hashing, copying and cache trimming touch whole files or directories;
+    # they run in the default executor so the shared event loop keeps
+    # reading every other conversion's progress meanwhile.
+    loop = asyncio.get_running_loop()
+    cached_path = None
+    cache_dir = _pdf_cache_dir()
+    if cache_dir is not None:
+        try:
+            key = await loop.run_in_executor(
+                None, _pdf_cache_key, epub_path,
+                (model, margin, font_size, font_override, embed_all_fonts, heuristics, PLUGIN_VERSION),
+            )
+            cached_path = os.path.join(cache_dir, f"{key}.pdf")
+            if os.path.isfile(cached_path):
+                await loop.run_in_executor(None, _link_or_copy, cached_path, out_path)
+                os.utime(cached_path)  # mark as recently used for LRU eviction
+                LOGGER.info("Using cached PDF for %s: %s", epub_path, cached_path)
+                if progress_cb is not None:
+                    progress_cb(1.0)
+                return out_path
+        except OSError:
+            LOGGER.warning("PDF cache lookup failed for %s", epub_path, exc_info=True)
 
     exe = _find_ebook_convert()
     cmd = [
@@ -119,50 +475,32 @@ def _convert_epub_to_pdf(epub_path: str, model: str, progress_cb=None,
     ]
     if embed_all_fonts:
         cmd.append('--embed-all-fonts')
+    if heuristics:
+        cmd.append('--enable-heuristics')
     if font_override:
         cmd.extend(['--pdf-serif-family', font_override])
 
-    popen_kwargs: dict = dict(stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if sys.platform == 'win32':
-        popen_kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-
-    pct_re = re.compile(r'(\d+)%')
-    timeout_secs = 300
-
+    succeeded = False
     try:
         LOGGER.info("Converting EPUB to PDF: %s", ' '.join(cmd))
-        proc = subprocess.Popen(cmd, **popen_kwargs)
-        deadline = time.monotonic() + timeout_secs
-
-        # Read stderr line-by-line for progress updates.
-        # ebook-convert writes progress like "33% Converting..." to stderr.
-        for line in proc.stderr:
-            if time.monotonic() > deadline:
-                proc.kill()
-                proc.wait()
-                raise TimeoutError(
-                    f"ebook-convert timed out after {timeout_secs}s"
-                )
-            m = pct_re.search(line)
-            if m and progress_cb is not None:
-                progress_cb(int(m.group(1)) / 100.0)
+        returncode, stdout_tail = await _run_ebook_convert(cmd, progress_cb)
 
-        proc.wait()
-
-        if proc.returncode != 0:
-            # Collect any remaining stdout for diagnostics
-            stdout_tail = (proc.stdout.read() or "")[:500]
-            LOGGER.error("ebook-convert failed (rc=%d): %s", proc.returncode, stdout_tail)
-            raise RuntimeError(f"Conversion failed (rc={proc.returncode}): {stdout_tail}")
+        if returncode != 0:
+            LOGGER.error("ebook-convert failed (rc=%d): %s", returncode, stdout_tail)
+            raise RuntimeError(f"Conversion failed (rc={returncode}): {stdout_tail}")
 
         LOGGER.info("Converted EPUB to PDF: %s (%s, %.1fx%.1f in)", out_path, model, width_in, height_in)
+        if cached_path:
+            await loop.run_in_executor(None, _store_cached_pdf, out_path, cached_path)
+        succeeded = True
         return out_path
-    except Exception:
-        try:
-            os.unlink(out_path)
-        except OSError:
-            pass
-        raise
+    finally:
+        # Also runs on cancellation, which is not an Exception subclass.
+        if not succeeded:
+            try:
+                os.unlink(out_path)
+            except OSError:
+                pass
 
 
 class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
@@ -173,7 +511,7 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
     description = "Send ePub and PDF files to reMarkable — no developer mode required"
     author = "Damian Hill"
     supported_platforms = ["linux", "windows", "osx"]
-    version = (1, 3, 0)
+    version = PLUGIN_VERSION
     minimum_calibre_version = (0, 7, 53)
 
     FORMATS = ["epub", "pdf"]
@@ -224,7 +562,9 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
         0,     # pdf_margin: 0 = use model default
         0,     # pdf_font_size: 0 = use model default
         "",    # pdf_font: "" = system default serif
-        True,  # embed_all_fonts: embed all fonts in PDF output
+        False, # embed_all_fonts: embed all fonts in PDF output
+        False, # heuristics: run ebook-convert heuristic processing
+        True,  # skip_existing: don't re-send books already in the target folder
     ]
 
     # ------------------------------------------------------------------
@@ -237,15 +577,23 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
 
     @classmethod
     def save_settings(cls, config_widget):
+        global _settings_cache
         cls._config().set('extra_customization', config_widget.commit())
+        _settings_cache = None
 
     @classmethod
     def _settings(cls) -> PluginSettings:
+        # Called on every device poll; only rebuild when the stored values change.
+        # Calibre re-parses its prefs on each settings() call, so compare
+        # contents rather than identity.
+        global _settings_cache
         extra = cls.settings().extra_customization or []
+        if _settings_cache is not None and _settings_cache[0] == extra:
+            return _settings_cache[1]
         defaults = cls.EXTRA_CUSTOMIZATION_DEFAULT
         def _get(i, fallback):
             return extra[i] if i < len(extra) and extra[i] is not None else fallback
-        return PluginSettings(
+        parsed = PluginSettings(
             IP=_get(0, defaults[0]),
             model=_get(1, defaults[1]),
             preferred_format=_get(2, defaults[2]),
@@ -255,14 +603,18 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
             pdf_font_size=int(_get(6, defaults[6]) or 0),
             pdf_font=str(_get(7, defaults[7]) or ""),
             embed_all_fonts=bool(_get(8, defaults[8])),
+            heuristics=bool(_get(9, defaults[9])),
+            skip_existing=bool(_get(10, defaults[10])),
         )
+        _settings_cache = (list(extra), parsed)
+        return parsed
 
     # ------------------------------------------------------------------
     # Device lifecycle
     # ------------------------------------------------------------------
 
-    _last_detection_check: float = 0.0
-    _DETECTION_INTERVAL: float = 5.0  # seconds between HTTP polls
+    _DETECTION_INTERVAL: float = 5.0  # seconds between reachability polls
+    _FORCED_PROBE_WAIT: float = 5.0   # max seconds a forced refresh waits for a probe
 
     @trace_calls
     def startup(self):
@@ -275,25 +627,27 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
 
     @trace_calls
     def detect_managed_devices(self, devices_on_system: List, force_refresh=False):
-        import time
-        global _device
+        # Reachability is polled on a background thread; this just reads
+        # the latest result, unless a fresh probe is explicitly requested.
+        global _confirmed_ip
         cfg = self._settings()
-
-        now = time.monotonic()
-        if not force_refresh and (now - self._last_detection_check) < self._DETECTION_INTERVAL:
-            return _device
-        self._last_detection_check = now
-
-        try:
-            if rm_web_interface.is_reachable(cfg.IP):
-                if _device is None:
-                    _device = DeviceInfo(cfg.IP)
-                    LOGGER.info("Detected: %s", _device)
-                return _device
-        except Exception:
-            LOGGER.warning("Device detection failed", exc_info=True)
-            _device = None
-        return None
+        _ensure_probe(cfg.IP, self._DETECTION_INTERVAL)
+        if force_refresh:
+            _probe_done.clear()
+            _probe_wake.set()
+            _probe_done.wait(self._FORCED_PROBE_WAIT)
+        device = _device
+        if not _device_reachable or device is None:
+            _confirmed_ip = None
+            return None
+        if _confirmed_ip != device.ip:
+            # New device: confirm the web interface answers, not just the
+            # port.  Done here rather than in the probe because uploads run
+            # on this thread too, so the GET can't land mid-batch.
+            if not rm_web_interface.is_webservice_reachable(device.ip):
+                return None
+            _confirmed_ip = device.ip
+        return device
 
     @trace_calls
     def debug_managed_device_detection(self, devices_on_system, output):
@@ -314,8 +668,10 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
 
     @trace_calls
     def eject(self):
-        global _device
+        global _device, _tree_cache
         _device = None
+        _tree_cache = None
+        rm_web_interface.clear_folder_cache()
 
     @trace_calls
     def get_device_information(self, end_session=True):
@@ -365,8 +721,7 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
             def _scan_progress(msg):
                 # Parse "Scanning reMarkable... N items found" and map
                 # N to a fraction between 0.1 and 0.7 (assume ~100 items max).
-                import re
-                m = re.search(r'(\d+)\s+items?\s+found', msg)
+                m = _ITEMS_RE.search(msg)
                 if m:
                     count = int(m.group(1))
                     frac = 0.1 + min(count / 100.0, 1.0) * 0.6
@@ -374,9 +729,14 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
                     frac = 0.1
                 self.report_progress(frac, msg)
 
-            tree = rm_web_interface.build_file_tree(
-                cfg.IP, "", progress_cb=_scan_progress,
-            )
+            tree = _cached_tree()
+            if tree is None:
+                tree = rm_web_interface.build_file_tree(
+                    cfg.IP, "", progress_cb=_scan_progress,
+                )
+                _cache_tree(tree)
+            else:
+                LOGGER.debug("Reusing device tree scanned < %.0fs ago", TREE_CACHE_TTL)
             self.report_progress(0.8, "Building book list...")
             on_device = _books_from_tree(tree)
             LOGGER.info("Book list: %d entries", len(on_device))
@@ -386,13 +746,15 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
 
         self.report_progress(0.9, "Syncing book list...")
 
-        for book in booklist:
-            if book not in on_device:
-                on_device.append(book)
-
+        # Append device books that match nothing already in the booklist.
+        # Book equality means "shares any identifier" (see Book.__eq__), so
+        # index every identifier once instead of scanning the list per book.
+        index = booklist.index_by_ids()
         for book in on_device:
-            if book not in booklist:
+            if DeviceBookList.find_match(book, index) is None:
                 booklist.append(book)
+                for key in book.identity_keys():
+                    index.setdefault(key, book)
 
         self.report_progress(1.0, "")
         return booklist, None, None
@@ -403,13 +765,13 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
 
     @trace_calls
     def upload_books(self, files_original, names, on_card=None, end_session=True, metadata: list[Metadata] = None):
+        global _tree_cache
         if not files_original:
             return ([], metadata or [], None)
 
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import ThreadPoolExecutor
 
         cfg = self._settings()
-        locations = []
         metadata = metadata or [None] * len(files_original)
 
         # Resolve target folder name to device folder ID.
@@ -428,104 +790,157 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
                     cfg.target_folder,
                 )
 
-        n = len(files_original)
+        # Documents already in the target folder, as (name, file_type).
+        existing: set[tuple[str, str]] = set()
+        if cfg.skip_existing:
+            try:
+                existing = {
+                    (e.name, e.file_type)
+                    for e in rm_web_interface.list_folder(cfg.IP, folder_id)
+                    if not e.is_folder
+                }
+            except Exception:
+                LOGGER.warning("Could not list target folder; sending all books", exc_info=True)
 
         # ------------------------------------------------------------------
         # Phase 1: Convert EPUBs to PDF in parallel (CPU-bound subprocesses)
         # ------------------------------------------------------------------
-        # Build a list of (index, local_path, upload_name, needs_convert)
-        # and pre-convert all EPUBs before uploading.
-        upload_items: list[dict] = []
+        # Build one UploadItem per file and pre-convert all EPUBs before uploading.
+        # Path splitting happens once per item here; later phases reuse the parts.
+        convert_epubs = cfg.preferred_format == "pdf"
+        upload_items: list[UploadItem] = []
         for i, (local_path, visible_name, meta) in enumerate(zip(files_original, names, metadata)):
             upload_name = os.path.basename(visible_name)
-            needs_convert = (cfg.preferred_format == "pdf"
-                             and os.path.splitext(local_path)[1].lower() == ".epub")
-            upload_items.append({
-                "index": i,
-                "local_path": local_path,
-                "upload_name": upload_name,
-                "visible_name": visible_name,
-                "meta": meta,
-                "needs_convert": needs_convert,
-                "converted_path": None,  # filled by conversion phase
-                "cleanup_path": None,
-            })
-
-        items_to_convert = [it for it in upload_items if it["needs_convert"]]
+            needs_convert = convert_epubs and local_path[-5:].lower() == ".epub"
+            stem, ext = os.path.splitext(upload_name)
+            # Match the name the file will have once converted; the device may
+            # list it with or without its extension.
+            target_type = "pdf" if needs_convert else ext[1:].lower()
+            skip = ((stem, target_type) in existing
+                    or (f"{stem}.{target_type}", target_type) in existing)
+            if skip:
+                LOGGER.info("Skipping %s: already on device as %s.%s", upload_name, stem, target_type)
+            upload_items.append(UploadItem(
+                index=i,
+                local_path=local_path,
+                upload_name=upload_name,
+                upload_stem=stem,
+                visible_name=visible_name,
+                meta=meta,
+                needs_convert=needs_convert,
+                skip=skip,
+            ))
+
+        items_to_convert = [it for it in upload_items if it.needs_convert and not it.skip]
         if items_to_convert:
-            # Scale workers: 1 per book, capped at CPU count (min 2, max 4)
-            max_workers = min(max(os.cpu_count() or 2, 2), 4, len(items_to_convert))
-            LOGGER.info("Converting %d EPUBs in parallel (%d workers)", len(items_to_convert), max_workers)
+            max_workers = _conversion_concurrency(len(items_to_convert))
+            LOGGER.info("Converting %d EPUBs in parallel (%d at a time)", len(items_to_convert), max_workers)
             self.report_progress(0.01, f"Converting {len(items_to_convert)} books...")
 
-            convert_done = 0
-
-            def _do_convert(item):
-                return _convert_epub_to_pdf(
-                    item["local_path"], cfg.model,
-                    margin_override=cfg.pdf_margin,
-                    font_size_override=cfg.pdf_font_size,
-                    font_override=cfg.pdf_font,
-                    embed_all_fonts=cfg.embed_all_fonts,
-                )
-
-            with ThreadPoolExecutor(max_workers=max_workers) as pool:
-                future_to_item = {pool.submit(_do_convert, it): it for it in items_to_convert}
-                for future in as_completed(future_to_item):
-                    item = future_to_item[future]
+            async def _convert(item, limit, done):
+                async with limit:
                     try:
-                        pdf_path = future.result()
-                        item["converted_path"] = pdf_path
-                        item["cleanup_path"] = pdf_path
-                        item["local_path"] = pdf_path
-                        item["upload_name"] = os.path.splitext(item["upload_name"])[0] + ".pdf"
+                        pdf_path = await _convert_epub_to_pdf(
+                            item.local_path, cfg.model,
+                            margin_override=cfg.pdf_margin,
+                            font_size_override=cfg.pdf_font_size,
+                            font_override=cfg.pdf_font,
+                            embed_all_fonts=cfg.embed_all_fonts,
+                            heuristics=cfg.heuristics,
+                        )
                     except Exception:
-                        LOGGER.error("Conversion failed for %s", item["upload_name"], exc_info=True)
+                        LOGGER.error("Conversion failed for %s", item.upload_name, exc_info=True)
                         raise
-                    convert_done += 1
-                    frac = 0.01 + (convert_done / len(items_to_convert)) * 0.39
-                    self.report_progress(frac, f"Converted {convert_done}/{len(items_to_convert)}")
+                item.converted_path = pdf_path
+                item.cleanup_path = pdf_path
+                item.local_path = pdf_path
+                item.upload_name = item.upload_stem + ".pdf"
+                done.append(item)
+                frac = 0.01 + (len(done) / len(items_to_convert)) * 0.39
+                self.report_progress(frac, f"Converted {len(done)}/{len(items_to_convert)}")
+
+            async def _convert_all():
+                # One event loop drives every ebook-convert process and its
+                # pipes; the semaphore caps how many run at once.
+                limit = asyncio.Semaphore(max_workers)
+                done: list[UploadItem] = []
+                tasks = [asyncio.ensure_future(_convert(it, limit, done)) for it in items_to_convert]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    for item in done:
+                        try:
+                            os.unlink(item.cleanup_path)
+                        except OSError:
+                            pass
+                    raise
+
+            asyncio.run(_convert_all())
 
         # ------------------------------------------------------------------
-        # Phase 2: Upload sequentially (device handles one at a time)
+        # Phase 2: Upload sequentially (device handles one POST at a time)
         # ------------------------------------------------------------------
-        # Navigate to target folder once before the upload loop.
-        if folder_id:
-            try:
-                rm_web_interface.fetch_documents(cfg.IP, folder_id)
-            except Exception:
-                LOGGER.warning("Pre-upload folder navigation failed", exc_info=True)
-
+        to_upload = [it for it in upload_items if not it.skip]
+        n = len(to_upload)
         upload_base = 0.40 if items_to_convert else 0.01
 
-        for i, item in enumerate(upload_items):
-            upload_frac_start = upload_base + (i / n) * (1.0 - upload_base)
-            upload_frac_end = upload_base + ((i + 1) / n) * (1.0 - upload_base)
-
-            self.report_progress(upload_frac_start, f"Uploading: {item['upload_name']}")
-
-            def _upload_progress(frac, _s=upload_frac_start, _e=upload_frac_end):
-                self.report_progress(_s + frac * (_e - _s),
-                                     f"Uploading: {item['upload_name']}")
-
-            try:
-                locations.append(item["visible_name"])
-                LOGGER.info("Uploading: %s as %s", item["local_path"], item["upload_name"])
-                rm_web_interface.upload_file(
-                    cfg.IP, item["local_path"], folder_id, item["upload_name"],
-                    inject_cover=cfg.inject_cover,
-                    progress_cb=_upload_progress,
-                    navigate=False,  # already navigated above
-                )
-            finally:
-                if item["cleanup_path"]:
-                    try:
-                        os.unlink(item["cleanup_path"])
-                    except OSError:
-                        pass
-
-            self.report_progress(upload_frac_end, "")
+        def _prepare(item):
+            return rm_web_interface.prepare_upload(
+                item.local_path, item.upload_name, inject_cover=cfg.inject_cover,
+            )
 
+        # One keep-alive connection serves the whole batch.  Every upload
+        # re-navigates to the target folder first (one small GET on that
+        # connection): the device's current folder is server-side state
+        # that any other listing resets.  POSTs stay strictly serial, but
+        # the next file is read and packaged on a helper thread while the
+        # current one is being sent.
+        session = rm_web_interface.DeviceSession(cfg.IP)
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        pending = prefetch.submit(_prepare, to_upload[0]) if to_upload else None
+        try:
+            for i, item in enumerate(to_upload):
+                upload_frac_start = upload_base + (i / n) * (1.0 - upload_base)
+                upload_frac_end = upload_base + ((i + 1) / n) * (1.0 - upload_base)
+
+                self.report_progress(upload_frac_start, f"Uploading: {item.upload_name}")
+
+                def _upload_progress(frac, _s=upload_frac_start, _e=upload_frac_end):
+                    self.report_progress(_s + frac * (_e - _s),
+                                         f"Uploading: {item.upload_name}")
+
+                try:
+                    prepared = pending.result()
+                    pending = prefetch.submit(_prepare, to_upload[i + 1]) if i + 1 < n else None
+                    LOGGER.info("Uploading: %s as %s", item.local_path, item.upload_name)
+                    rm_web_interface.upload_file(
+                        cfg.IP, item.local_path, folder_id, item.upload_name,
+                        inject_cover=cfg.inject_cover,
+                        progress_cb=_upload_progress,
+                        session=session,
+                        prepared=prepared,
+                    )
+                finally:
+                    if item.cleanup_path:
+                        try:
+                            os.unlink(item.cleanup_path)
+                        except OSError:
+                            pass
+
+                self.report_progress(upload_frac_end, "")
+        finally:
+            prefetch.shutdown(wait=True)
+            if pending is not None and pending.exception() is None:
+                pending.result().cleanup()  # prefetched but never sent
+            session.close()
+            # The device now holds new documents whose IDs we don't know.
+            _tree_cache = None
+
+        # Skipped books are reported too: Calibre should see them as on the device.
+        locations = [it.visible_name for it in upload_items]
         return (locations, metadata, None)
 
     # ------------------------------------------------------------------
@@ -551,8 +966,7 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
     @classmethod
     def remove_books_from_metadata(cls, paths, booklists):
         bl: DeviceBookList = booklists[0]
-        for book in [b for b in bl if b.path in paths]:
-            bl.remove_book(book)
+        bl.remove_paths(paths)
 
     # ------------------------------------------------------------------
     # Metadata
@@ -609,7 +1023,10 @@ class RemarkableUsbDevice(DeviceConfig, DevicePlugin):
         self.report_progress = report_progress or (lambda x, y: x)
 
     @trace_calls
-    def shutdown(self): return super().shutdown()
+    def shutdown(self):
+        _probe_stop.set()
+        _probe_wake.set()
+        return super().shutdown()
 
     @trace_calls
     def synchronize_with_db(self, db, book_id, book_metadata, first_call): return super().synchronize_with_db(db, book_id, book_metadata, first_call)
@@ -0,0 +1,5 @@
+"""Python version shims shared by the reMarkable Calibre plugin modules."""
+import sys
+
+# dataclass(slots=True) needs Python 3.10; older Calibre builds get plain classes.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
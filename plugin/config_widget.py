@@ -5,20 +5,74 @@ plus per-model PDF conversion presets (margin, font size, font).
 """
 from __future__ import annotations
 
+from types import MappingProxyType
+from typing import NamedTuple
+
 try:
-    from qt.core import (QButtonGroup, QCheckBox, QFormLayout, QGroupBox,
-                          QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                          QRadioButton, QSpinBox, QVBoxLayout, QWidget)
+    from qt.core import (QAbstractButton, QButtonGroup, QCheckBox, QFormLayout,
+                          QGroupBox, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                          QRadioButton, QSpinBox, QVBoxLayout, QWidget, pyqtSlot)
 except ImportError:
-    from PyQt5.Qt import (QButtonGroup, QCheckBox, QFormLayout, QGroupBox,
-                           QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                           QRadioButton, QSpinBox, QVBoxLayout, QWidget)
+    from PyQt5.Qt import (QAbstractButton, QButtonGroup, QCheckBox, QFormLayout,
+                           QGroupBox, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                           QRadioButton, QSpinBox, QVBoxLayout, QWidget, pyqtSlot)
+
+
+class Preset(NamedTuple):
+    """Recommended PDF settings for one device model (in points)."""
+    margin: int
+    font_size: int
+
 
 # Model presets — mirrors DEVICE_PDF_SETTINGS in __init__.py
-MODEL_PRESETS = {
-    "rm2":       {"margin": 36, "font_size": 18},
-    "paper-pro": {"margin": 36, "font_size": 20},
-    "pro-move":  {"margin": 18, "font_size": 14},
+MODEL_PRESETS = MappingProxyType({
+    "rm2":       Preset(margin=36, font_size=18),
+    "paper-pro": Preset(margin=36, font_size=20),
+    "pro-move":  Preset(margin=18, font_size=14),
+})
+DEFAULT_MODEL = "paper-pro"
+
+
+def _preset_for(model: str) -> Preset:
+    """Return the preset for model, falling back to the default model."""
+    return MODEL_PRESETS.get(model) or MODEL_PRESETS[DEFAULT_MODEL]
+
+
+# Widget tooltips, keyed by setting.
+_TOOLTIPS = {
+    "ip": (
+        "Connect your reMarkable via USB, then enable\n"
+        "Settings > Storage to start the USB web interface."
+    ),
+    "margin": (
+        "Page margin in points (all four sides).\n"
+        "Set to 0 to use the model default."
+    ),
+    "font_size": (
+        "Default font size in points.\n"
+        "Set to 0 to use the model default."
+    ),
+    "font": (
+        "Serif font family for body text.\n"
+        "Examples: Georgia, Bookerly, Literata, Palatino\n"
+        "Leave empty for the system default."
+    ),
+    "reset": "Reset margin and font size to the selected model's recommended values.",
+    "embed_fonts": (
+        "When enabled, all fonts are embedded in the PDF.\n"
+        "Disable for faster conversion — the reMarkable will\n"
+        "use its own fonts for any non-embedded fonts."
+    ),
+    "heuristics": (
+        "Run ebook-convert's heuristic processing pass.\n"
+        "Can speed up conversion and clean up poorly\n"
+        "formatted EPUBs, but may alter some layouts."
+    ),
+    "folder": "Name of a folder on your reMarkable to upload into.",
+    "skip_existing": (
+        "Don't convert or re-send a book when a document with the\n"
+        "same name and format is already in the target folder."
+    ),
 }
 
 
@@ -32,8 +86,10 @@ class RemarkableConfigWidget(QWidget):
         extra = plugin.settings().extra_customization or []
         defaults = plugin.EXTRA_CUSTOMIZATION_DEFAULT
 
-        def _get(i, fallback):
-            return extra[i] if i < len(extra) and extra[i] is not None else fallback
+        # Saved values, padded with defaults for unset or missing entries.
+        n = len(extra)
+        settings = tuple(extra[i] if i < n and extra[i] is not None else default
+                         for i, default in enumerate(defaults))
 
         layout = QVBoxLayout(self)
 
@@ -41,60 +97,42 @@ class RemarkableConfigWidget(QWidget):
         conn = QGroupBox("Connection")
         conn_form = QFormLayout()
 
-        self.ip_edit = QLineEdit(_get(0, defaults[0]))
+        self.ip_edit = QLineEdit(settings[0])
         self.ip_edit.setPlaceholderText("10.11.99.1")
-        self.ip_edit.setToolTip(
-            "Connect your reMarkable via USB, then enable\n"
-            "Settings > Storage to start the USB web interface."
-        )
+        self.ip_edit.setToolTip(_TOOLTIPS["ip"])
         conn_form.addRow("IP address:", self.ip_edit)
 
         conn.setLayout(conn_form)
         layout.addWidget(conn)
 
         # -- Device Model (radio buttons) --
-        model_group = QGroupBox("Device model")
-        model_layout = QVBoxLayout()
-        self._model_buttons = QButtonGroup(self)
-
         models = [
             ("rm2", "reMarkable 1 / 2  (6.2\u2033 \u00d7 8.3\u2033)"),
             ("paper-pro", "Paper Pro  (7.1\u2033 \u00d7 9.4\u2033)"),
             ("pro-move", "Paper Pro Move  (3.6\u2033 \u00d7 6.4\u2033)"),
         ]
-        current_model = _get(1, defaults[1])
-        for i, (value, label) in enumerate(models):
-            rb = QRadioButton(label)
-            rb.setProperty("model_value", value)
-            if value == current_model:
-                rb.setChecked(True)
-            self._model_buttons.addButton(rb, i)
-            model_layout.addWidget(rb)
-
-        model_group.setLayout(model_layout)
+        current_model = settings[1]
+        preset = _preset_for(current_model)
+        model_group, self._model_buttons = self._build_radio_group(
+            "Device model", models, current_model, "model_value")
         layout.addWidget(model_group)
 
-        # -- Preferred Format (radio buttons) --
-        fmt_group = QGroupBox("Preferred format")
-        fmt_layout = QVBoxLayout()
-        self._format_buttons = QButtonGroup(self)
+        # Mirrors the checked button so reads don't go through Qt.
+        self._current_model = current_model if current_model in dict(models) else DEFAULT_MODEL
 
+        # -- Preferred Format (radio buttons) --
         formats = [
             ("pdf", "PDF \u2014 converts EPUBs for your screen (recommended)"),
             ("epub", "EPUB \u2014 send as-is"),
         ]
-        current_fmt = _get(2, defaults[2])
-        for i, (value, label) in enumerate(formats):
-            rb = QRadioButton(label)
-            rb.setProperty("format_value", value)
-            if value == current_fmt:
-                rb.setChecked(True)
-            self._format_buttons.addButton(rb, i)
-            fmt_layout.addWidget(rb)
-
-        fmt_group.setLayout(fmt_layout)
+        current_fmt = settings[2]
+        fmt_group, self._format_buttons = self._build_radio_group(
+            "Preferred format", formats, current_fmt, "format_value")
         layout.addWidget(fmt_group)
 
+        self._current_format = current_fmt if current_fmt in dict(formats) else "pdf"
+        self._format_buttons.buttonClicked.connect(self._on_format_changed)
+
         # -- PDF Conversion Settings --
         pdf_group = QGroupBox("PDF conversion settings")
         pdf_form = QFormLayout()
@@ -103,63 +141,54 @@ class RemarkableConfigWidget(QWidget):
         self.margin_spin = QSpinBox()
         self.margin_spin.setRange(0, 144)
         self.margin_spin.setSuffix(" pt")
-        self.margin_spin.setToolTip(
-            "Page margin in points (all four sides).\n"
-            "Set to 0 to use the model default."
-        )
-        saved_margin = int(_get(5, defaults[5]) or 0)
+        self.margin_spin.setToolTip(_TOOLTIPS["margin"])
+        saved_margin = int(settings[5] or 0)
         if saved_margin:
             self.margin_spin.setValue(saved_margin)
         else:
-            self.margin_spin.setValue(MODEL_PRESETS.get(current_model, MODEL_PRESETS["paper-pro"])["margin"])
+            self.margin_spin.setValue(preset.margin)
         pdf_form.addRow("Margin:", self.margin_spin)
 
         # Font size (in points)
         self.font_size_spin = QSpinBox()
         self.font_size_spin.setRange(8, 48)
         self.font_size_spin.setSuffix(" pt")
-        self.font_size_spin.setToolTip(
-            "Default font size in points.\n"
-            "Set to 0 to use the model default."
-        )
-        saved_font_size = int(_get(6, defaults[6]) or 0)
+        self.font_size_spin.setToolTip(_TOOLTIPS["font_size"])
+        saved_font_size = int(settings[6] or 0)
         if saved_font_size:
             self.font_size_spin.setValue(saved_font_size)
         else:
-            self.font_size_spin.setValue(MODEL_PRESETS.get(current_model, MODEL_PRESETS["paper-pro"])["font_size"])
+            self.font_size_spin.setValue(preset.font_size)
         pdf_form.addRow("Font size:", self.font_size_spin)
 
         # Font family
-        self.font_edit = QLineEdit(str(_get(7, defaults[7]) or ""))
+        self.font_edit = QLineEdit(str(settings[7] or ""))
         self.font_edit.setPlaceholderText("System default (serif)")
-        self.font_edit.setToolTip(
-            "Serif font family for body text.\n"
-            "Examples: Georgia, Bookerly, Literata, Palatino\n"
-            "Leave empty for the system default."
-        )
+        self.font_edit.setToolTip(_TOOLTIPS["font"])
         pdf_form.addRow("Font:", self.font_edit)
 
         # Preset label + reset button
         preset_row = QHBoxLayout()
         self._preset_label = QLabel()
-        self._update_preset_label(current_model)
+        self._update_preset_label(preset)
         preset_row.addWidget(self._preset_label)
         preset_row.addStretch()
         reset_btn = QPushButton("Reset to model defaults")
-        reset_btn.setToolTip("Reset margin and font size to the selected model's recommended values.")
+        reset_btn.setToolTip(_TOOLTIPS["reset"])
         reset_btn.clicked.connect(self._reset_to_presets)
         preset_row.addWidget(reset_btn)
         pdf_form.addRow("", preset_row)
 
         self.embed_fonts_check = QCheckBox("Embed all fonts (slower, higher fidelity)")
-        self.embed_fonts_check.setChecked(bool(_get(8, defaults[8]) if len(defaults) > 8 else True))
-        self.embed_fonts_check.setToolTip(
-            "When enabled, all fonts are embedded in the PDF.\n"
-            "Disable for faster conversion — the reMarkable will\n"
-            "use its own fonts for any non-embedded fonts."
-        )
+        self.embed_fonts_check.setChecked(bool(settings[8]))
+        self.embed_fonts_check.setToolTip(_TOOLTIPS["embed_fonts"])
         pdf_form.addRow("", self.embed_fonts_check)
 
+        self.heuristics_check = QCheckBox("Enable heuristic processing")
+        self.heuristics_check.setChecked(bool(settings[9]))
+        self.heuristics_check.setToolTip(_TOOLTIPS["heuristics"])
+        pdf_form.addRow("", self.heuristics_check)
+
         pdf_group.setLayout(pdf_form)
         layout.addWidget(pdf_group)
 
@@ -170,47 +199,77 @@ class RemarkableConfigWidget(QWidget):
         upload = QGroupBox("Upload options")
         upload_form = QFormLayout()
 
-        self.folder_edit = QLineEdit(_get(3, defaults[3]))
+        self.folder_edit = QLineEdit(settings[3])
         self.folder_edit.setPlaceholderText("Leave empty for root")
-        self.folder_edit.setToolTip("Name of a folder on your reMarkable to upload into.")
+        self.folder_edit.setToolTip(_TOOLTIPS["folder"])
         upload_form.addRow("Target folder:", self.folder_edit)
 
         self.cover_check = QCheckBox("Inject cover page when EPUB is missing one")
-        self.cover_check.setChecked(bool(_get(4, defaults[4])))
+        self.cover_check.setChecked(bool(settings[4]))
         upload_form.addRow("", self.cover_check)
 
+        self.skip_existing_check = QCheckBox("Skip books already in the target folder")
+        self.skip_existing_check.setChecked(bool(settings[10]))
+        self.skip_existing_check.setToolTip(_TOOLTIPS["skip_existing"])
+        upload_form.addRow("", self.skip_existing_check)
+
         upload.setLayout(upload_form)
         layout.addWidget(upload)
 
         layout.addStretch()
 
+    def _build_radio_group(self, title: str, items: list[tuple[str, str]], current: str,
+                           property_key: str) -> tuple[QGroupBox, QButtonGroup]:
+        """Build a group box of radio buttons, one per (value, label) item.
+
+        Each button stores its value in the property_key Qt property; the
+        button whose value equals current starts checked.
+        """
+        group = QGroupBox(title)
+        group_layout = QVBoxLayout()
+        buttons = QButtonGroup(self)
+        for i, (value, label) in enumerate(items):
+            rb = QRadioButton(label)
+            rb.setProperty(property_key, value)
+            if value == current:
+                rb.setChecked(True)
+            buttons.addButton(rb, i)
+            group_layout.addWidget(rb)
+        group.setLayout(group_layout)
+        return group, buttons
+
     def _selected_model(self) -> str:
-        btn = self._model_buttons.checkedButton()
-        return btn.property("model_value") if btn else "paper-pro"
+        return self._current_model
 
     def _selected_format(self) -> str:
-        btn = self._format_buttons.checkedButton()
-        return btn.property("format_value") if btn else "pdf"
+        return self._current_format
 
-    def _update_preset_label(self, model: str):
-        preset = MODEL_PRESETS.get(model, MODEL_PRESETS["paper-pro"])
+    def _update_preset_label(self, preset: Preset):
         self._preset_label.setText(
-            f"Model defaults: {preset['margin']} pt margin, {preset['font_size']} pt font"
+            f"Model defaults: {preset.margin} pt margin, {preset.font_size} pt font"
         )
 
+    @pyqtSlot(QAbstractButton)
     def _on_model_changed(self, button):
         model = button.property("model_value")
-        self._update_preset_label(model)
-        preset = MODEL_PRESETS.get(model, MODEL_PRESETS["paper-pro"])
-        self.margin_spin.setValue(preset["margin"])
-        self.font_size_spin.setValue(preset["font_size"])
+        if model == self._current_model:
+            return  # re-clicked the checked model: keep the user's values
+        self._current_model = model
+        preset = _preset_for(self._current_model)
+        self._update_preset_label(preset)
+        self.margin_spin.setValue(preset.margin)
+        self.font_size_spin.setValue(preset.font_size)
         self.font_edit.clear()
 
+    @pyqtSlot(QAbstractButton)
+    def _on_format_changed(self, button):
+        self._current_format = button.property("format_value")
+
+    @pyqtSlot()
     def _reset_to_presets(self):
-        model = self._selected_model()
-        preset = MODEL_PRESETS.get(model, MODEL_PRESETS["paper-pro"])
-        self.margin_spin.setValue(preset["margin"])
-        self.font_size_spin.setValue(preset["font_size"])
+        preset = _preset_for(self._selected_model())
+        self.margin_spin.setValue(preset.margin)
+        self.font_size_spin.setValue(preset.font_size)
         self.font_edit.clear()
 
     def validate(self):
@@ -228,4 +287,6 @@ class RemarkableConfigWidget(QWidget):
             self.font_size_spin.value(),
             self.font_edit.text().strip(),
             self.embed_fonts_check.isChecked(),
+            self.heuristics_check.isChecked(),
+            self.skip_existing_check.isChecked(),
         ]
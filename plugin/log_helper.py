@@ -6,9 +6,17 @@ _log = logging.getLogger(__name__)
 
 
 def trace_calls(fn):
-    """Decorator that logs function entry with arguments at DEBUG level."""
+    """Decorator that logs function entry with arguments at DEBUG level.
+
+    Under python -O the function is returned unwrapped.
+    """
+    if not __debug__:
+        return fn
+
     @functools.wraps(fn)
     def wrapper(*args, **kwargs):
-        _log.debug("-> %s(args=%s, kwargs=%s)", fn.__qualname__, args, kwargs)
+        # Checked per call: logging is usually configured after decoration.
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("-> %s(args=%s, kwargs=%s)", fn.__qualname__, args, kwargs)
         return fn(*args, **kwargs)
     return wrapper
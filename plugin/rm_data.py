@@ -4,12 +4,18 @@ from __future__ import annotations
 import random
 import time
 from dataclasses import dataclass, field
-from typing import List
+from types import MappingProxyType
+from typing import Sequence
 
 from calibre.devices.interface import BookList  # type: ignore
 
+from .compat import _SLOTS
 
-@dataclass
+# Calibre expects get_collections() to return {collection name: [books]}.
+_NO_COLLECTIONS = MappingProxyType({})
+
+
+@dataclass(**_SLOTS)
 class PluginSettings:
     """Plugin configuration from Calibre's settings dialog."""
     IP: str
@@ -20,19 +26,36 @@ class PluginSettings:
     pdf_margin: int = 0             # 0 = use model default
     pdf_font_size: int = 0          # 0 = use model default
     pdf_font: str = ""              # "" = system default serif
-    embed_all_fonts: bool = True    # embed all fonts in PDF output
+    embed_all_fonts: bool = False   # embed all fonts in PDF output
+    heuristics: bool = False        # run ebook-convert heuristic processing
+    skip_existing: bool = True      # don't re-send books already in the target folder
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DeviceInfo:
     """Describes a detected reMarkable device."""
     ip: str
-    session_id: int = field(default_factory=lambda: random.randint(0, 9_999_999_999))
+    session_id: int = field(default_factory=lambda: random.getrandbits(34))  # ~1.7e10 ids
 
     def __str__(self) -> str:
         return f"reMarkable at http://{self.ip} (session={self.session_id})"
 
 
+@dataclass(**_SLOTS)
+class UploadItem:
+    """One file queued by upload_books, tracked through conversion and upload."""
+    index: int
+    local_path: str                 # file to upload (the converted PDF once converted)
+    upload_name: str                # file name sent to the device
+    upload_stem: str                # upload_name without its extension
+    visible_name: str               # Calibre's name for the book, returned as location
+    meta: object
+    needs_convert: bool
+    skip: bool                      # already on the device: neither convert nor upload
+    converted_path: str | None = None  # filled by conversion phase
+    cleanup_path: str | None = None    # temp file to remove after upload
+
+
 class DeviceBookList(BookList):
     """Calibre BookList implementation for the reMarkable."""
 
@@ -48,29 +71,62 @@ class DeviceBookList(BookList):
     def remove_book(self, book):
         self.remove(book)
 
+    def remove_paths(self, paths) -> None:
+        """Drop every book whose path is in paths, in a single pass."""
+        paths = set(paths)
+        self[:] = [book for book in self if book.path not in paths]
+
     def get_collections(self, collection_attributes):
-        return self
+        return _NO_COLLECTIONS
+
+    def index_by_ids(self) -> dict[tuple[str, str], Book]:
+        """Map every identifier in the list (see Book.identity_keys) to its Book.
+
+        Built once per sync so matching a book is a few dict probes instead
+        of an __eq__ call against every entry.
+        """
+        index = {}
+        for book in self:
+            for key in book.identity_keys():
+                index.setdefault(key, book)
+        return index
+
+    @staticmethod
+    def find_match(book: Book, index: dict[tuple[str, str], Book]) -> Book | None:
+        """Return the indexed Book equal to book, probing tiers in __eq__ order."""
+        for key in book.identity_keys():
+            match = index.get(key)
+            if match is not None:
+                return match
+        return None
 
 
 @dataclass
 class Book:
-    """A book tracked by the plugin (on device or in transit)."""
+    """A book tracked by the plugin (on device or in transit).
+
+    Not slotted: Calibre sets its own attributes on device books.
+    """
     title: str
     uuid: str
     rm_uuid: str = ""
-    authors: list[str] = field(default_factory=list)
+    # Empty sequences default to a shared () rather than a new list per Book;
+    # device scans create thousands of Books that never fill these in.
+    authors: Sequence[str] = ()
     author_sort: str = ""
     size: int = 0
     datetime: time.struct_time = field(default_factory=time.localtime)
     thumbnail: object = None
-    tags: list[str] = field(default_factory=list)
+    tags: Sequence[str] = ()
     path: str = "/"
-    device_collections: List = field(default_factory=list)
+    device_collections: Sequence = ()
     in_library: str | None = None  # set by Calibre to indicate library match
 
     def __post_init__(self):
-        if isinstance(self.datetime, (list, tuple)):
-            self.datetime = time.struct_time(self.datetime)
+        # struct_time is itself a tuple; the default needs no conversion.
+        dt = self.datetime
+        if type(dt) is not time.struct_time and isinstance(dt, (list, tuple)):
+            self.datetime = time.struct_time(dt)
 
     def __eq__(self, other):
         """Loose equality: two Books match if ANY shared identifier matches.
@@ -91,12 +147,32 @@ class Book:
         name is identical.  When names diverge, sync_booklists appends
         both, creating phantom duplicates.
         """
-        if not isinstance(other, Book):
+        # type() check first: sync_booklists compares Books against Books
+        # almost exclusively, so skip the isinstance MRO walk in that case.
+        if type(other) is not Book and not isinstance(other, Book):
             return NotImplemented
-        if self.rm_uuid and other.rm_uuid and self.rm_uuid == other.rm_uuid:
-            return True
-        if self.uuid and other.uuid and self.uuid == other.uuid:
+        # Equality implies the other side is non-empty too, so only one side
+        # needs the truthiness test.
+        s = self.rm_uuid
+        if s and s == other.rm_uuid:
             return True
-        if self.path and other.path and self.path != "/" and other.path != "/" and self.path == other.path:
+        s = self.uuid
+        if s and s == other.uuid:
             return True
-        return False
+        s = self.path
+        return bool(s) and s != "/" and s == other.path
+
+    def identity_keys(self) -> tuple[tuple[str, str], ...]:
+        """Return the (tier, value) identifiers __eq__ matches on.
+
+        Two Books are equal exactly when their identity_keys() intersect,
+        which lets callers replace list membership scans with set lookups.
+        """
+        keys = []
+        if self.rm_uuid:
+            keys.append(("rm_uuid", self.rm_uuid))
+        if self.uuid:
+            keys.append(("uuid", self.uuid))
+        if self.path and self.path != "/":
+            keys.append(("path", self.path))
+        return tuple(keys)
@@ -5,20 +5,53 @@ Endpoints: GET /documents/{id} for metadata, POST /upload for file transfer.
 """
 from __future__ import annotations
 
+import http.client
 import io
-import json
 import logging
 import mimetypes
 import os
 import posixpath
+import socket
+import struct
 import tempfile
+import threading
+import time
 import uuid
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from typing import Iterator
 from urllib import request
 from urllib.error import HTTPError
+from urllib.parse import urlsplit
 from xml.etree import ElementTree as ET
 
+from .compat import _SLOTS
+
+# Folder listings are parsed with the fastest JSON library available; every
+# candidate accepts the raw response bytes.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    try:
+        from ujson import loads as _json_loads
+    except ImportError:
+        from json import loads as _json_loads
+
+# OPF patching uses lxml when present (Calibre bundles it): it parses and
+# serializes large manifests much faster than ElementTree.  Entities are
+# not resolved and nothing is fetched, since the epub is untrusted input.
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+    _OPF_PARSER = None
+    _XML_ERRORS: tuple[type[Exception], ...] = (ET.ParseError,)
+else:
+    _OPF_PARSER = _lxml_etree.XMLParser(resolve_entities=False, no_network=True,
+                                        remove_comments=True, remove_pis=True)
+    _XML_ERRORS = (ET.ParseError, _lxml_etree.XMLSyntaxError)
+
 log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -29,7 +62,7 @@ COLLECTION = "CollectionType"
 DOCUMENT = "DocumentType"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DeviceEntry:
     """A single file or folder on the reMarkable."""
     entry_id: str
@@ -40,13 +73,14 @@ class DeviceEntry:
 
     @staticmethod
     def from_json(raw: dict) -> DeviceEntry:
+        get = raw.get
         return DeviceEntry(
             entry_id=raw["ID"],
-            parent_id=raw.get("Parent", ""),
+            parent_id=get("Parent", ""),
             # Note: "VissibleName" is the actual field name in the reMarkable API (their typo)
-            name=str(raw.get("VissibleName", "")),
-            entry_type=str(raw.get("Type", DOCUMENT)),
-            file_type=str(raw.get("fileType", "")),
+            name=str(get("VissibleName", "")),
+            entry_type=str(get("Type", DOCUMENT)),
+            file_type=str(get("fileType", "")),
         )
 
     @property
@@ -59,49 +93,47 @@ class FileTree:
     """Recursive tree of device entries rooted at a folder."""
     entries: list[FileTreeNode] = field(default_factory=list)
 
+    def _walk(self, prefix: str = "") -> Iterator[tuple[str, DeviceEntry]]:
+        """Yield (path, entry) for every entry, depth-first in listing order.
+
+        Iterative, with an explicit stack of (entries iterator, path prefix)
+        frames, so deep trees don't recurse.
+        """
+        stack = [(iter(self.entries), prefix)]
+        while stack:
+            nodes, base = stack[-1]
+            for node in nodes:
+                entry = node.entry
+                path = f"{base}{entry.name}"
+                yield path, entry
+                if entry.is_folder:
+                    stack.append((iter(node.subtree.entries), f"{path}/"))
+                    break
+            else:
+                stack.pop()
+
+    def iter_files(self, prefix: str = "") -> Iterator[tuple[str, DeviceEntry]]:
+        """Yield (path, entry) pairs for all non-folder entries, recursively."""
+        return ((path, e) for path, e in self._walk(prefix) if not e.is_folder)
+
     def all_files(self, prefix: str = "") -> list[tuple[str, DeviceEntry]]:
         """Return (path, entry) pairs for all non-folder entries, recursively."""
-        result = []
-        for node in self.entries:
-            if node.entry.is_folder:
-                sub_prefix = f"{prefix}{node.entry.name}/"
-                result.extend(node.subtree.all_files(sub_prefix))
-            else:
-                result.append((f"{prefix}{node.entry.name}", node.entry))
-        return result
+        return list(self.iter_files(prefix))
 
     def all_file_names(self, prefix: str = "") -> list[str]:
-        return [path for path, _ in self.all_files(prefix)]
+        return [path for path, e in self._walk(prefix) if not e.is_folder]
 
     def all_file_ids(self) -> list[str]:
         """Return entry_id for all non-folder entries, recursively."""
-        ids = []
-        for node in self.entries:
-            if node.entry.is_folder:
-                ids.extend(node.subtree.all_file_ids())
-            else:
-                ids.append(node.entry.entry_id)
-        return ids
+        return [e.entry_id for _, e in self._walk() if not e.is_folder]
 
     def all_folder_paths(self, prefix: str = "") -> list[str]:
         """Return paths of all folders, recursively."""
-        result = []
-        for node in self.entries:
-            if node.entry.is_folder:
-                path = f"{prefix}{node.entry.name}"
-                result.append(path)
-                result.extend(node.subtree.all_folder_paths(f"{path}/"))
-        return result
+        return [path for path, e in self._walk(prefix) if e.is_folder]
 
     def folder_id_map(self, prefix: str = "") -> dict[str, str]:
         """Return {folder_path: entry_id} for all folders, recursively."""
-        mapping = {}
-        for node in self.entries:
-            if node.entry.is_folder:
-                path = f"{prefix}{node.entry.name}"
-                mapping[path] = node.entry.entry_id
-                mapping.update(node.subtree.folder_id_map(f"{path}/"))
-        return mapping
+        return {path: e.entry_id for path, e in self._walk(prefix) if e.is_folder}
 
 
 @dataclass
@@ -121,41 +153,75 @@ _MIME_TYPES = {
 }
 
 
-def _build_multipart(filename: str, file_data: bytes, content_type: str | None = None) -> tuple[bytes, str]:
-    """Build a multipart/form-data body for uploading a single file.
+def _multipart_envelope(filename: str, content_type: str | None = None) -> tuple[bytes, bytes, str]:
+    """Build the multipart/form-data framing for uploading a single file.
 
-    Returns (body_bytes, content_type_header).
+    The file contents go between the two parts, so they can be streamed
+    from disk instead of being copied into one body buffer.
+    Returns (preamble, epilogue, content_type_header).
     """
     boundary = f"----remarkable-{uuid.uuid4().hex}"
     if content_type is None:
         ext = os.path.splitext(filename)[1].lower()
         content_type = _MIME_TYPES.get(ext) or mimetypes.guess_type(filename)[0] or "application/octet-stream"
 
-    buf = io.BytesIO()
-    buf.write(f"--{boundary}\r\n".encode())
-    buf.write(f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode())
-    buf.write(f"Content-Type: {content_type}\r\n".encode())
-    buf.write(b"\r\n")
-    buf.write(file_data)
-    buf.write(b"\r\n")
-    buf.write(f"--{boundary}--\r\n".encode())
+    preamble = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n"
+        "\r\n"
+    ).encode()
+    epilogue = f"\r\n--{boundary}--\r\n".encode()
+    return preamble, epilogue, f"multipart/form-data; boundary={boundary}"
 
-    return buf.getvalue(), f"multipart/form-data; boundary={boundary}"
 
+def fetch_documents(ip: str, path_id: str, timeout: int = 10,
+                    session: DeviceSession | None = None) -> list[dict]:
+    """GET /documents/{path_id} — returns list of document metadata dicts.
 
-def fetch_documents(ip: str, path_id: str, timeout: int = 10) -> list[dict]:
-    """GET /documents/{path_id} — returns list of document metadata dicts."""
-    url = f"http://{ip}/documents/{path_id}"
-    req = request.Request(url, headers={
+    Pass a DeviceSession to send the request over its keep-alive connection.
+    """
+    headers = {
         "Content-Type": "application/json",
         "charset": "ISO-8859-1",
-    })
+    }
+    if session is not None:
+        return _json_loads(session.request("GET", f"/documents/{path_id}",
+                                          headers=headers, timeout=timeout))
+    req = request.Request(f"http://{ip}/documents/{path_id}", headers=headers)
     with request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read())
+        return _json_loads(resp.read())
+
+
+def list_folder(ip: str, folder_id: str, session: DeviceSession | None = None) -> list[DeviceEntry]:
+    """Return the direct children of a folder ("" for the root)."""
+    return [DeviceEntry.from_json(r) for r in fetch_documents(ip, folder_id, session=session)]
+
+
+def is_reachable(ip: str, timeout: float = 2) -> bool:
+    """Quick connectivity check: does the device accept a TCP connection?
+
+    The USB web interface only listens while it is enabled, so an open
+    port is a good sign; use is_webservice_reachable to confirm it answers.
+    """
+    try:
+        parts = urlsplit(f"http://{ip}")
+        host, port = parts.hostname, parts.port or 80
+    except ValueError:  # malformed port in the configured address
+        log.warning("Invalid reMarkable address %r", ip)
+        return False
+    if not host:
+        return False
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError as exc:
+        log.warning("Cannot reach reMarkable at %s: %s", ip, exc)
+        return False
 
 
-def is_reachable(ip: str) -> bool:
-    """Quick connectivity check against the device."""
+def is_webservice_reachable(ip: str) -> bool:
+    """Full check: does the web interface answer a document listing?"""
     try:
         fetch_documents(ip, "", timeout=2)
         return True
@@ -164,49 +230,105 @@ def is_reachable(ip: str) -> bool:
         return False
 
 
-def build_file_tree(ip: str, root_id: str, _depth: int = 0, max_depth: int = 20,
-                    progress_cb=None, _counter: list | None = None) -> FileTree:
-    """Recursively fetch the full document tree starting from root_id.
+_TREE_SCAN_WORKERS = 4  # concurrent folder listings during a tree scan
 
+
+def build_file_tree(ip: str, root_id: str, max_depth: int = 20, progress_cb=None,
+                    session: DeviceSession | None = None,
+                    max_workers: int = _TREE_SCAN_WORKERS) -> FileTree:
+    """Fetch the full document tree starting from root_id.
+
+    The tree is walked level by level; the folders of each level are
+    listed concurrently, each worker over its own keep-alive connection.
+    Pass a session to list everything serially over that connection.
     progress_cb(message) is called after each HTTP fetch so the caller
-    can update the UI.  _counter tracks total entries found across the
-    recursion (internal).
+    can update the UI.
     """
-    if _depth >= max_depth:
-        log.warning("Max folder depth (%d) reached, stopping recursion", max_depth)
-        return FileTree()
-
-    if _counter is None:
-        _counter = [0]
+    tree = FileTree()
+    level: list[tuple[str, FileTree]] = [(root_id, tree)]
+    count = 0
 
-    raw_list = fetch_documents(ip, root_id)
-    entries = [DeviceEntry.from_json(r) for r in raw_list]
-    entries.sort(key=lambda e: e.parent_id)
-    _counter[0] += len(entries)
+    local = threading.local()
+    sessions: list[DeviceSession] = []
 
-    if progress_cb:
-        progress_cb(f"Scanning reMarkable... {_counter[0]} items found")
+    def _fetch(folder_id: str) -> list[dict]:
+        s = getattr(local, "session", None)
+        if s is None:
+            s = local.session = DeviceSession(ip)
+            sessions.append(s)  # list.append is atomic
+        return fetch_documents(ip, folder_id, session=s)
 
-    tree = FileTree()
-    for entry in entries:
-        node = FileTreeNode(entry=entry)
-        tree.entries.append(node)
-        if entry.is_folder:
-            node.subtree = build_file_tree(
-                ip, entry.entry_id, _depth + 1, max_depth,
-                progress_cb=progress_cb, _counter=_counter,
-            )
+    pool = ThreadPoolExecutor(max_workers=max_workers) if session is None and max_workers > 1 else None
+    try:
+        depth = 0
+        while level:
+            if depth >= max_depth:
+                log.warning("Max folder depth (%d) reached, stopping recursion", max_depth)
+                break
+            folder_ids = [folder_id for folder_id, _ in level]
+            if pool is not None and len(folder_ids) > 1:
+                listings = pool.map(_fetch, folder_ids)
+            elif session is not None:
+                listings = (fetch_documents(ip, f, session=session) for f in folder_ids)
+            else:
+                listings = map(_fetch, folder_ids)
+
+            next_level = []
+            for (_, subtree), raw_list in zip(level, listings):
+                entries = [DeviceEntry.from_json(r) for r in raw_list]
+                entries.sort(key=lambda e: e.parent_id)
+                count += len(entries)
+                if progress_cb:
+                    progress_cb(f"Scanning reMarkable... {count} items found")
+                for entry in entries:
+                    node = FileTreeNode(entry=entry)
+                    subtree.entries.append(node)
+                    if entry.is_folder:
+                        next_level.append((entry.entry_id, node.subtree))
+            level = next_level
+            depth += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+        for s in sessions:
+            s.close()
 
     return tree
 
 
+FOLDER_CACHE_TTL = 30.0  # seconds a scanned folder map stays valid
+
+_folder_maps: dict[str, tuple[float, dict[str, str]]] = {}  # ip -> (monotonic ts, map)
+
+
+def clear_folder_cache(ip: str | None = None) -> None:
+    """Forget cached folder maps (for one device, or all of them)."""
+    if ip is None:
+        _folder_maps.clear()
+    else:
+        _folder_maps.pop(ip, None)
+
+
+def _folder_map(ip: str) -> dict[str, str]:
+    """Return {folder_path: entry_id}, rescanning at most every FOLDER_CACHE_TTL."""
+    cached = _folder_maps.get(ip)
+    if cached is not None and time.monotonic() - cached[0] < FOLDER_CACHE_TTL:
+        return cached[1]
+    folder_map = build_file_tree(ip, "", max_depth=3).folder_id_map()
+    _folder_maps[ip] = (time.monotonic(), folder_map)
+    return folder_map
+
+
 def find_folder_id(ip: str, folder_name: str) -> str:
-    """Look up a folder's ID by name. Returns "" if not found or empty name."""
+    """Look up a folder's ID by name. Returns "" if not found or empty name.
+
+    The device's folder map is cached for FOLDER_CACHE_TTL seconds, so
+    back-to-back sends don't rescan it.
+    """
     if not folder_name:
         return ""
     try:
-        tree = build_file_tree(ip, "", max_depth=3)
-        folder_map = tree.folder_id_map()
+        folder_map = _folder_map(ip)
         # Try exact match first, then case-insensitive
         if folder_name in folder_map:
             return folder_map[folder_name]
@@ -219,68 +341,184 @@ def find_folder_id(ip: str, folder_name: str) -> str:
     return ""
 
 
-class _ProgressBody:
-    """File-like wrapper that reports upload progress as data is read."""
+class DeviceSession:
+    """Keep-alive HTTP/1.1 connection to the device, reused across requests.
 
-    def __init__(self, data: bytes, callback=None):
-        self._data = data
-        self._pos = 0
-        self._cb = callback
+    The device web server handles one request at a time, so requests are
+    serialized with a lock.  If the server dropped a reused connection while
+    it sat idle, a GET is retried once on a fresh one.  Other methods are
+    never replayed: the device may already have stored an upload.
+    """
 
-    def read(self, size=-1):
-        if size < 0:
-            chunk = self._data[self._pos:]
-            self._pos = len(self._data)
-        else:
-            chunk = self._data[self._pos:self._pos + size]
-            self._pos += len(chunk)
-        if self._cb and self._data:
-            self._cb(self._pos / len(self._data))
-        return chunk
+    def __init__(self, ip: str):
+        self.ip = ip
+        self._conn: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
+
+    def request(self, method: str, path: str, body=None, headers: dict | None = None,
+                timeout: int = 10) -> bytes:
+        """Send a request and return the response body.
+
+        Raises urllib.error.HTTPError for 4xx/5xx responses.
+        """
+        with self._lock:
+            retried = False
+            while True:
+                reused = self._conn is not None
+                if self._conn is None:
+                    self._conn = http.client.HTTPConnection(self.ip, timeout=timeout)
+                else:
+                    self._conn.timeout = timeout
+                    if self._conn.sock is not None:
+                        self._conn.sock.settimeout(timeout)
+                try:
+                    if isinstance(body, _FileBody):
+                        self._conn.putrequest(method, path)
+                        for name, value in (headers or {}).items():
+                            self._conn.putheader(name, value)
+                        self._conn.endheaders()
+                        body.send_to(self._conn.sock)
+                    else:
+                        self._conn.request(method, path, body=body, headers=headers or {})
+                    resp = self._conn.getresponse()
+                    data = resp.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    self._close()
+                    if reused and not retried and method == "GET":
+                        retried = True
+                        continue
+                    raise
+                except Exception:
+                    self._close()
+                    raise
+                if resp.will_close:
+                    self._close()
+                if resp.status >= 400:
+                    raise HTTPError(f"http://{self.ip}{path}", resp.status, resp.reason,
+                                    resp.headers, io.BytesIO(data))
+                return data
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_SENDFILE_CHUNK = 1024 * 1024  # progress is reported after each chunk
+
+
+class _FileBody:
+    """Multipart request body streamed from disk: preamble, file, epilogue.
+
+    The file part goes out via socket.sendfile(), which uses the kernel's
+    zero-copy os.sendfile() where available and a plain send loop
+    elsewhere (e.g. Windows).
+    """
+
+    def __init__(self, path: str, preamble: bytes, epilogue: bytes, progress_cb=None):
+        self._path = path
+        self._preamble = preamble
+        self._epilogue = epilogue
+        self._cb = progress_cb
+        self._file_size = os.path.getsize(path)
 
     def __len__(self):
-        return len(self._data)
+        return len(self._preamble) + self._file_size + len(self._epilogue)
+
+    def send_to(self, sock):
+        total = len(self)
+        sock.sendall(self._preamble)
+        with open(self._path, "rb") as fp:
+            offset = 0
+            while offset < self._file_size:
+                sent = sock.sendfile(fp, offset, min(_SENDFILE_CHUNK, self._file_size - offset))
+                if not sent:
+                    raise OSError(f"sendfile stalled at byte {offset} of {self._path}")
+                offset += sent
+                if self._cb:
+                    self._cb((len(self._preamble) + offset) / total)
+        sock.sendall(self._epilogue)
+        if self._cb:
+            self._cb(1.0)
+
+
+@dataclass
+class PreparedUpload:
+    """A file ready to POST (see prepare_upload)."""
+    display_name: str
+    path: str
+    cleanup_path: str | None = None
+
+    def cleanup(self):
+        """Remove the temporary re-packaged epub, if one was made."""
+        if self.cleanup_path:
+            try:
+                os.unlink(self.cleanup_path)
+            except OSError:
+                pass
+            self.cleanup_path = None
+
+
+def prepare_upload(local_path: str, display_name: str, inject_cover: bool = True) -> PreparedUpload:
+    """Get a file ready for upload, without touching the device.
+
+    Epubs are re-packaged for reMarkable compatibility.  This is the file
+    I/O half of upload_file, so callers can prepare the next file while
+    the previous one is still being sent.
+    """
+    prepared_path, cleanup_path = _prepare_epub(local_path, inject_cover=inject_cover)
+    return PreparedUpload(display_name, prepared_path, cleanup_path)
 
 
 def upload_file(ip: str, local_path: str, folder_id: str, display_name: str,
                 inject_cover: bool = True, progress_cb=None, timeout: int = 120,
-                navigate: bool = True) -> dict:
+                navigate: bool = True, session: DeviceSession | None = None,
+                prepared: PreparedUpload | None = None) -> dict:
     """Upload a file to the reMarkable via POST /upload.
 
     Epubs are automatically re-packaged to fix ZIP compatibility issues
     and optionally inject a cover page if one is missing.
     progress_cb(fraction) is called as upload bytes are sent.
     Set navigate=False if the caller already navigated to the target folder.
+    Pass a DeviceSession to reuse one keep-alive connection across uploads,
+    and a PreparedUpload from prepare_upload to skip re-packaging the file
+    (upload_file cleans it up either way).
     """
     base = f"http://{ip}"
 
-    # The reMarkable web server is stateful — it needs a GET /documents/
-    # before it will accept uploads. Navigate to the target folder (or root).
-    if navigate:
-        try:
-            fetch_documents(ip, folder_id)
-        except Exception:
-            log.warning("Pre-upload navigation failed for folder=%s", folder_id, exc_info=True)
-
-    # Prepare epub for reMarkable compatibility
-    prepared_path, cleanup_path = _prepare_epub(local_path, inject_cover=inject_cover)
+    if prepared is None:
+        prepared = prepare_upload(local_path, display_name, inject_cover=inject_cover)
 
+    own_session = session is None
+    if own_session:
+        session = DeviceSession(ip)
     try:
-        with open(prepared_path, "rb") as fp:
-            body, content_type = _build_multipart(display_name, fp.read())
+        # The reMarkable web server is stateful — it needs a GET /documents/
+        # before it will accept uploads. Navigate to the target folder (or
+        # root) over the same connection the POST will use.
+        if navigate:
+            try:
+                fetch_documents(ip, folder_id, session=session)
+            except Exception:
+                log.warning("Pre-upload navigation failed for folder=%s", folder_id, exc_info=True)
 
-        upload_data = _ProgressBody(body, progress_cb) if progress_cb else body
-        req = request.Request(f"{base}/upload", data=upload_data, headers={
+        preamble, epilogue, content_type = _multipart_envelope(display_name)
+        body = _FileBody(prepared.path, preamble, epilogue, progress_cb)
+        headers = {
             "Origin": base,
             "Accept": "*/*",
             "Referer": f"{base}/",
             "Connection": "keep-alive",
             "Content-Length": str(len(body)),
             "Content-Type": content_type,
-        })
+        }
         try:
-            with request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read())
+            return _json_loads(session.request("POST", "/upload", body=body,
+                                              headers=headers, timeout=timeout))
         except HTTPError as exc:
             error_body = exc.read().decode("utf-8", errors="replace")
             log.error("Upload HTTP %d: %s (file=%s, folder=%s, size=%d)",
@@ -290,11 +528,9 @@ def upload_file(ip: str, local_path: str, folder_id: str, display_name: str,
                 f"[file={display_name}, size={len(body)}]"
             ) from exc
     finally:
-        if cleanup_path:
-            try:
-                os.unlink(cleanup_path)
-            except OSError:
-                pass
+        prepared.cleanup()
+        if own_session:
+            session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -305,6 +541,19 @@ _OPF_NS = "http://www.idpf.org/2007/opf"
 _DC_NS = "http://purl.org/dc/elements/1.1/"
 _CONTAINER_NS = "urn:oasis:names:tc:opendocument:xmlns:container"
 
+# Namespaced tags and search paths, formatted once at import
+_TAG_ROOTFILE = f"{{{_CONTAINER_NS}}}rootfile"
+_TAG_META = f"{{{_OPF_NS}}}meta"
+_TAG_MANIFEST = f"{{{_OPF_NS}}}manifest"
+_TAG_ITEM = f"{{{_OPF_NS}}}item"
+_TAG_SPINE = f"{{{_OPF_NS}}}spine"
+_TAG_ITEMREF = f"{{{_OPF_NS}}}itemref"
+_TAG_GUIDE = f"{{{_OPF_NS}}}guide"
+_TAG_REFERENCE = f"{{{_OPF_NS}}}reference"
+_FIND_ROOTFILE = f".//{_TAG_ROOTFILE}"
+_FIND_COVER_META = f".//{_TAG_META}[@name='cover']"
+_FIND_COVER_META_BARE = ".//meta[@name='cover']"  # OPFs that omit the namespace
+
 _COVER_PAGE_HTML = """\
 <?xml version="1.0" encoding="UTF-8"?>
 <html xmlns="http://www.w3.org/1999/xhtml">
@@ -330,15 +579,16 @@ def _prepare_epub(path: str, inject_cover: bool = True) -> tuple[str, str | None
        cover art.
 
     Returns (path_to_upload, path_to_cleanup_or_none).
-    Non-epub files pass through unchanged.
+    Non-epub files, and epubs that need neither fix, pass through unchanged.
     """
     if not path.lower().endswith(".epub"):
         return path, None
 
     try:
         with zipfile.ZipFile(path, "r") as src:
+            infos = src.infolist()
             # Locate the OPF package file
-            opf_path = _locate_opf(src)
+            opf_path = _locate_opf(src, infos)
             patched_opf = None
             new_files: dict[str, bytes] = {}
 
@@ -346,9 +596,13 @@ def _prepare_epub(path: str, inject_cover: bool = True) -> tuple[str, str | None
                 try:
                     opf_bytes = src.read(opf_path)
                     patched_opf, new_files = _ensure_cover_page(src, opf_path, opf_bytes)
-                except (KeyError, ET.ParseError):
+                except (KeyError, *_XML_ERRORS):
                     pass
 
+            if patched_opf is None and not _needs_repack(src, infos):
+                log.debug("Epub already device-compatible: %s", path)
+                return path, None
+
             # Write clean epub — mimetype MUST be first entry with no extra fields
             # per the EPUB OCF spec, otherwise devices reject it as a plain ZIP.
             out = tempfile.NamedTemporaryFile(suffix=".epub", delete=False)
@@ -362,13 +616,16 @@ def _prepare_epub(path: str, inject_cover: bool = True) -> tuple[str, str | None
                 mi.extra = b""
                 dst.writestr(mi, b"application/epub+zip")
 
-                for item in src.infolist():
+                for item in infos:
                     if item.filename == "mimetype":
                         continue  # already written above
-                    data = src.read(item.filename)
                     if patched_opf and item.filename == opf_path:
-                        data = patched_opf
-                    dst.writestr(item.filename, data, compress_type=zipfile.ZIP_DEFLATED)
+                        dst.writestr(item.filename, patched_opf, compress_type=zipfile.ZIP_DEFLATED)
+                    elif item.compress_type in _RAW_COPY_TYPES and not item.flag_bits & 0x1:
+                        _copy_entry_raw(src, dst, item)
+                    else:
+                        dst.writestr(item.filename, src.read(item.filename),
+                                     compress_type=zipfile.ZIP_DEFLATED)
 
                 for fname, fdata in new_files.items():
                     dst.writestr(fname, fdata, compress_type=zipfile.ZIP_DEFLATED)
@@ -380,16 +637,91 @@ def _prepare_epub(path: str, inject_cover: bool = True) -> tuple[str, str | None
         return path, None
 
 
-def _locate_opf(zf: zipfile.ZipFile) -> str | None:
-    """Find the OPF package document path inside an epub."""
+# Entries already stored or deflated are copied without recompressing;
+# anything else (bzip2, lzma, ...) is re-deflated for the device.
+_RAW_COPY_TYPES = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+_LOCAL_HEADER_SIZE = 30
+_COPY_CHUNK = 1024 * 1024
+
+
+def _needs_repack(src: zipfile.ZipFile, infos: list[zipfile.ZipInfo]) -> bool:
+    """Return False if the archive is already in the shape the device accepts.
+
+    That means a stored, extra-free "mimetype" entry first, and every entry
+    stored or deflated, unencrypted, and without a data descriptor (bit 3).
+    """
+    if not infos:
+        return True
+    first = infos[0]
+    if first.filename != "mimetype" or first.compress_type != zipfile.ZIP_STORED or first.extra:
+        return True
+    for item in infos:
+        if item.flag_bits & 0x09 or item.compress_type not in _RAW_COPY_TYPES:
+            return True
+    # The local header can carry extra fields the central directory doesn't.
+    src.fp.seek(first.header_offset)
+    header = src.fp.read(_LOCAL_HEADER_SIZE)
+    if header[:4] != zipfile.stringFileHeader or struct.unpack("<H", header[28:30])[0]:
+        return True
+    return src.read(first) != b"application/epub+zip"
+
+
+def _copy_entry_raw(src: zipfile.ZipFile, dst: zipfile.ZipFile, item: zipfile.ZipInfo) -> None:
+    """Copy one entry's compressed bytes from src to dst under a clean header.
+
+    The new local header carries the sizes and CRC up front, so the data
+    descriptor flag (bit 3) and any extra fields are dropped without
+    inflating and re-deflating the data.
+    """
+    src.fp.seek(item.header_offset)
+    header = src.fp.read(_LOCAL_HEADER_SIZE)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local header for {item.filename}")
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    src.fp.seek(name_len + extra_len, os.SEEK_CUR)
+
+    zinfo = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+    zinfo.compress_type = item.compress_type
+    # Same attributes writestr gives a bare filename: a 0600 file, or a
+    # 0775 directory with the MS-DOS directory bit for names ending in "/".
+    if item.filename.endswith("/"):
+        zinfo.external_attr = 0o40775 << 16 | 0x10
+    else:
+        zinfo.external_attr = 0o600 << 16
+    zinfo.CRC = item.CRC
+    zinfo.compress_size = item.compress_size
+    zinfo.file_size = item.file_size
+
+    # ZipFile has no public raw-write API; this mirrors what writestr does
+    # around its compressor.
+    zinfo.header_offset = dst.fp.tell()
+    dst.fp.write(zinfo.FileHeader())
+    remaining = item.compress_size
+    while remaining:
+        chunk = src.fp.read(min(remaining, _COPY_CHUNK))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated entry {item.filename}")
+        dst.fp.write(chunk)
+        remaining -= len(chunk)
+    dst.filelist.append(zinfo)
+    dst.NameToInfo[zinfo.filename] = zinfo
+    dst.start_dir = dst.fp.tell()
+    dst._didModify = True
+
+
+def _locate_opf(zf: zipfile.ZipFile, infos: list[zipfile.ZipInfo] | None = None) -> str | None:
+    """Find the OPF package document path inside an epub.
+
+    infos is zf.infolist(), if the caller already has it.
+    """
     try:
         container = ET.fromstring(zf.read("META-INF/container.xml"))
-        rootfile = container.find(f".//{{{_CONTAINER_NS}}}rootfile")
+        rootfile = container.find(_FIND_ROOTFILE)
         if rootfile is not None:
             return rootfile.get("full-path")
     except (KeyError, ET.ParseError):
         pass
-    for item in zf.infolist():
+    for item in infos if infos is not None else zf.infolist():
         if item.filename.endswith(".opf"):
             return item.filename
     return None
@@ -400,57 +732,53 @@ def _ensure_cover_page(zf: zipfile.ZipFile, opf_path: str, opf_bytes: bytes) ->
 
     Returns (patched_opf_bytes_or_none, {new_filename: bytes}).
     """
-    root = ET.fromstring(opf_bytes)
+    etree = _lxml_etree or ET
+    if _lxml_etree is not None:
+        root = _lxml_etree.fromstring(opf_bytes, _OPF_PARSER)
+    else:
+        root = ET.fromstring(opf_bytes)
 
     # Find cover image ID from <meta name="cover" content="..."/>
-    cover_img_id = None
-    for meta in root.iter(f"{{{_OPF_NS}}}meta"):
-        if meta.get("name") == "cover":
-            cover_img_id = meta.get("content")
-            break
-    if not cover_img_id:
-        for meta in root.iter("meta"):
-            if meta.get("name") == "cover":
-                cover_img_id = meta.get("content")
-                break
+    cover_meta = root.find(_FIND_COVER_META)
+    if cover_meta is None:
+        cover_meta = root.find(_FIND_COVER_META_BARE)
+    cover_img_id = cover_meta.get("content") if cover_meta is not None else None
 
     if not cover_img_id:
         return None, {}
 
     # Look up the manifest item
-    manifest = root.find(f"{{{_OPF_NS}}}manifest")
+    manifest = root.find(_TAG_MANIFEST)
     if manifest is None:
         return None, {}
 
+    # First item wins for duplicate ids, as with a linear scan.
+    manifest_by_id = {item.get("id"): item for item in reversed(manifest.findall(_TAG_ITEM))}
+
     cover_href = None
-    for item in manifest.findall(f"{{{_OPF_NS}}}item"):
-        if item.get("id") == cover_img_id:
-            media = item.get("media-type", "")
-            if media.startswith("image/"):
-                cover_href = item.get("href")
-            break
+    item = manifest_by_id.get(cover_img_id)
+    if item is not None and item.get("media-type", "").startswith("image/"):
+        cover_href = item.get("href")
 
     if not cover_href:
         return None, {}
 
     # Check whether the first spine page already shows the cover
-    spine = root.find(f"{{{_OPF_NS}}}spine")
+    spine = root.find(_TAG_SPINE)
     if spine is None or len(spine) == 0:
         return None, {}
 
-    first_ref_id = spine[0].get("idref", "")
-    for item in manifest.findall(f"{{{_OPF_NS}}}item"):
-        if item.get("id") == first_ref_id:
-            href = item.get("href", "")
-            opf_dir = posixpath.dirname(opf_path)
-            full = posixpath.join(opf_dir, href) if opf_dir else href
-            try:
-                page_text = zf.read(full).decode("utf-8", errors="replace")
-                if cover_href in page_text:
-                    return None, {}  # Already has a cover page
-            except KeyError:
-                pass
-            break
+    item = manifest_by_id.get(spine[0].get("idref", ""))
+    if item is not None:
+        href = item.get("href", "")
+        opf_dir = posixpath.dirname(opf_path)
+        full = posixpath.join(opf_dir, href) if opf_dir else href
+        try:
+            page_text = zf.read(full).decode("utf-8", errors="replace")
+            if cover_href in page_text:
+                return None, {}  # Already has a cover page
+        except KeyError:
+            pass
 
     # Build cover page XHTML
     page_id = "rm-cover-page"
@@ -461,28 +789,31 @@ def _ensure_cover_page(zf: zipfile.ZipFile, opf_path: str, opf_bytes: bytes) ->
     xhtml = _COVER_PAGE_HTML.format(href=cover_href)
 
     # Patch manifest
-    new_item = ET.SubElement(manifest, f"{{{_OPF_NS}}}item")
+    new_item = etree.SubElement(manifest, _TAG_ITEM)
     new_item.set("id", page_id)
     new_item.set("href", page_filename)
     new_item.set("media-type", "application/xhtml+xml")
 
     # Patch spine — insert cover page first
-    ref = ET.Element(f"{{{_OPF_NS}}}itemref")
+    ref = etree.Element(_TAG_ITEMREF)
     ref.set("idref", page_id)
     spine.insert(0, ref)
 
     # Add/create guide element
-    guide = root.find(f"{{{_OPF_NS}}}guide")
+    guide = root.find(_TAG_GUIDE)
     if guide is None:
-        guide = ET.SubElement(root, f"{{{_OPF_NS}}}guide")
-    guide_ref = ET.SubElement(guide, f"{{{_OPF_NS}}}reference")
+        guide = etree.SubElement(root, _TAG_GUIDE)
+    guide_ref = etree.SubElement(guide, _TAG_REFERENCE)
     guide_ref.set("type", "cover")
     guide_ref.set("title", "Cover")
     guide_ref.set("href", page_filename)
 
-    # Serialize
-    ET.register_namespace("", _OPF_NS)
-    ET.register_namespace("dc", _DC_NS)
-    patched = ET.tostring(root, encoding="unicode", xml_declaration=True).encode("utf-8")
+    # Serialize (lxml keeps the document's own namespace prefixes)
+    if _lxml_etree is not None:
+        patched = _lxml_etree.tostring(root, encoding="utf-8", xml_declaration=True)
+    else:
+        ET.register_namespace("", _OPF_NS)
+        ET.register_namespace("dc", _DC_NS)
+        patched = ET.tostring(root, encoding="unicode", xml_declaration=True).encode("utf-8")
 
     return patched, {page_zip_path: xhtml.encode("utf-8")}